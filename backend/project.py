@@ -1,9 +1,103 @@
-import gobnb, json, sqlite3, re
-from datetime import datetime
+import atexit
+import functools
+import os
+import threading
+from operator import itemgetter
+
+import json, re, sqlite3
+
+from backend import url_utils
 
 
 DATABASE = r"./db/database.db"
 
+# C-level getters for pulling single fields out of the scraped dict lists
+get_title = itemgetter("title")
+get_url = itemgetter("url")
+
+# Matches every <br> variant the scraped descriptions contain, so they can all
+# be turned into newlines in a single pass
+BR_TAG_RE = re.compile(r"<br\s*/?>")
+
+# Maps the checkbox labels the frontend sends over to the listing keys; built
+# once here instead of on every row lookup
+CHECKBOX_CONTENTS = {
+    "ID": "id",
+    "Rating": "average_rating",
+    "URL": "url",
+    "Duration": "duration",
+    "location": "location",
+    "Getting Around": "getting_around",
+    "Check In/ Out Timing": "check_in_out",
+    "Layout": "layout",
+    "Capacity": "capacity",
+    "Cost": "cost",
+    "Super Host": "super_host",
+    "Amenities": "amenities",
+    "Notes": "notes",
+    "Images": "images",
+    "Cover": "cover",
+}
+
+# Use orjson for the hot encode/decode paths when it is installed, as it is
+# several times faster than the standard library; fall back to json otherwise
+try:
+    import orjson
+
+    def json_loads(data) -> any:
+        return orjson.loads(data)
+
+    def json_dumps(value) -> str:
+        return orjson.dumps(value).decode()
+
+except ImportError:
+    json_loads = json.loads
+    json_dumps = json.dumps
+
+# Applied to every connection: WAL lets readers run during writes and
+# NORMAL halves the fsyncs per commit
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-20000",
+    "PRAGMA mmap_size=268435456",
+)
+
+# One connection per database file, reused across calls and threads
+connections = {}
+
+# Serialises writes since the shared connections are used from eel's threads
+write_lock = threading.Lock()
+
+
+def get_connection(database: str = DATABASE) -> sqlite3.Connection:
+    """
+    Returns the shared connection for the given database, creating it on first use
+
+    Args:
+        database (str): the database file that the connection is for
+    """
+
+    conn = connections.get(database)
+
+    if conn is None:
+        conn = sql_create_connection(database, check_same_thread=False)
+        connections[database] = conn
+
+    return conn
+
+
+def close_connections() -> None:
+    """Closes every shared connection; registered to run when the process exits"""
+
+    for conn in connections.values():
+        conn.close()
+    connections.clear()
+
+
+atexit.register(close_connections)
+
 
 class Listing:
 
@@ -12,9 +106,40 @@ class Listing:
         cls, link: str, costs: list, currency="SGD"
     ) -> None:
         """
-        Scrapes the listing for the more important information, before storing it into a json file (more for myself)
+        Scrapes the listing for the more important information, before storing it into the database
+
+        Results from scraping is in a dict that is then analysed and stored in a sqlite database
+        """
+
+        info = cls.build_info(link, costs, currency)
+
+        # Add the entry into SQLite; the tables are created once at startup
+        sql_add_entry(DATABASE, info)
+
+        # The new listing invalidates any cached searches
+        retrieve_from_location_cached.cache_clear()
+
+    @classmethod
+    def add_many(cls, links_costs: list, currency="SGD") -> None:
+        """
+        Scrapes several listings and stores them all in one batched transaction
+
+        Args:
+            links_costs (list): (link, costs) pairs, as accepted by add_listing
+        """
+
+        infos = [cls.build_info(link, costs, currency) for link, costs in links_costs]
+
+        sql_add_entries(DATABASE, infos)
+        retrieve_from_location_cached.cache_clear()
+
+    @classmethod
+    def build_info(cls, link: str, costs: list, currency="SGD") -> dict:
+        """
+        Scrapes the listing and filters the result down to the information worth keeping
 
-        Results from scraping is in a dict that is then analysed, the rest of which is stored in a sqlite database
+        Returns:
+            dict: the filtered information, keyed by database column
         """
 
         if not link or len(costs) != 2:
@@ -23,13 +148,18 @@ class Listing:
         # Calls another function to get the required information from the url
         id, stay_length = cls.extract_from_url(link)
 
+        # gobnb pulls in a whole scraping stack, so it is only imported once a
+        # scrape is actually requested (repeat imports hit the module cache)
+        import gobnb
+
         # Scrape the listing for the required information, except cost (AirBnB website is >:( )
         data = gobnb.Get_from_room_url(link, currency, "")
 
-        # Format and export into json file for myself to see and debugging
-        json_data = json.dumps(data, indent=4)
-        with open("result.json", "w") as file:
-            file.write(json_data)
+        # Export into a json file for debugging when asked for; json.dump streams
+        # straight into the file instead of building the whole string in memory
+        if os.getenv("AIRBNB_DEBUG_JSON"):
+            with open("result.json", "w") as file:
+                json.dump(data, file, indent=4)
 
         # Tidy and filter the more important information from the dictionary above
         info = {
@@ -40,64 +170,59 @@ class Listing:
             "misc_cost": costs[1],
         }
 
-        # Basic information
-        info["coordinates"] = json.dumps(data["coordinates"])
+        # Basic information; coordinates stay a dict and are json-encoded once
+        # at the database layer
+        info["coordinates"] = data["coordinates"]
         info["super_host"] = data["is_super_host"]
         info["capacity"] = data["person_capacity"]
 
-        # Average rating
+        # Average rating, skipping the review count in a single pass over the dict
+        ratings = data["rating"]
         info["average_rating"] = round(
-            (
-                sum(float(value) for key, value in data["rating"].items())
-                - float(data["rating"]["review_count"])
-            )
-            / (len(data["rating"]) - 1),
+            sum(float(value) for key, value in ratings.items() if key != "review_count")
+            / (len(ratings) - 1),
             2,
         )
 
         # Check in and out
-        info["check_in_out"] = [
-            item["title"] for item in data["house_rules"]["general"][0]["values"]
-        ]
+        info["check_in_out"] = list(
+            map(get_title, data["house_rules"]["general"][0]["values"])
+        )
 
         # Gets layout
-        info["layout"] = [data["sub_description"]["items"]]
+        info["layout"] = data["sub_description"]["items"]
 
-        # Gets amenities, creates an empty dictionary to store values in
-        amenities = {}
+        # Gets amenities in one pass, with the title of each entry as the key
+        # and what it contains as the value
+        info["amenities"] = {
+            get_title(entry): list(map(get_title, entry["values"]))
+            for entry in data["amenities"]
+        }
 
-        # Iterates over amenities, adding the title of each entry as the key and what it contains as the value
-        for entry in data["amenities"]:
-            amenity_title = entry["title"]
-            amenity_values = [item["title"] for item in entry["values"]]
+        # Gets images into a list
+        info["images"] = list(map(get_url, data["images"]))
 
-            amenities[amenity_title] = amenity_values
+        # Gets location description, keyed by lowercased title for O(1) lookups
+        descriptions = {
+            dict_pair["title"].lower(): dict_pair
+            for dict_pair in data["location_descriptions"]
+        }
+        getting_around = descriptions.pop("getting around", None)
+        if getting_around is None or len(descriptions) != 1:
+            raise ValueError("length of location description is unexpected (not 2)")
 
-        info["amenities"] = amenities
+        info["getting_around"] = BR_TAG_RE.sub("\n", getting_around["content"])
 
-        # Gets images into a list
-        info["images"] = [dict_pair["url"] for dict_pair in data["images"]]
-
-        # Gets location description
-        if len(data["location_descriptions"]) != 2:
-            return ValueError("length of location description is unexpected (not 2)")
-        for dict_pair in data["location_descriptions"]:
-            if dict_pair["title"].lower() == "getting around":
-                info["getting_around"] = dict_pair["content"].replace("<br />", "\n")
-            else:
-                info["location"] = dict_pair["title"].replace("\u014d", "o")
+        # The remaining description's title is the location itself
+        location = next(iter(descriptions.values()))
+        info["location"] = location["title"].replace("\u014d", "o")
 
         print("Scraping completed, all filtering of data done")
-        print("Scraping completed, all filtering done")
-
-        # Creates the tables to store the description if they do not yet exist
-        create_tables(DATABASE)
 
-        # Add the entry into SQLite
-        sql_add_entry(DATABASE, info)
+        return info
 
     @classmethod
-    def extract_from_url(cls, link: str) -> None:
+    def extract_from_url(cls, link: str) -> tuple:
         """
         To extract information from the url provided, namely the id and duration of stay
 
@@ -105,25 +230,7 @@ class Listing:
             link (str): Airbnb link
         """
 
-        # Search through url for required information - id, check in and check out date
-        match = re.search(
-            r"^https:\/\/www\.airbnb\.com(?:\.sg)?\/rooms\/(\d+)\?.*check_in=(.{10}).*check_out=(.{10})",
-            link,
-        )
-
-        # Identifying and storing of information from url
-        id = match.group(1)
-        check_in = datetime.fromisoformat(match.group(2))
-        check_out = datetime.fromisoformat(match.group(3))
-
-        if check_out < check_in:
-            raise ValueError
-
-        # Convert length of stay into number of days
-        stay_length = check_out - check_in
-        stay_length = int(stay_length.total_seconds() / (86_400))
-
-        return id, stay_length
+        return url_utils.extract_from_url(link)
 
     @classmethod
     def sql_get(cls, id: int) -> dict:
@@ -137,24 +244,16 @@ class Listing:
             dict: key value pairs of the required information
         """
 
-        conn = sql_create_connection(DATABASE)
+        conn = get_connection(DATABASE)
 
         with conn:
             cursor = conn.cursor()
-            # Selects the json file
-            cursor.execute("SELECT json FROM json WHERE listing_id = ?", (id,))
-
-            # Fetches the json
+            # One JOIN across the three tables fetches the whole listing
+            cursor.execute(SELECT_LISTING + "WHERE m.id = ?", (id,))
             row = cursor.fetchone()
 
-            # Select the others comments
-            cursor.execute("SELECT notes FROM others WHERE listing_id = ?", (id,))
-            notes = cursor.fetchone()
-
         if row:
-            json_data = json.loads(row[0])
-            json_data["notes"] = notes[0]
-            return json_data
+            return sql_row_to_listing(row)
         else:
             print(f"Error: ID {id} not found")
             return None
@@ -173,25 +272,7 @@ def retrieve_from_json(column: str, listing: dict) -> any:
         any: returns the entry, which can be in any form such as a string or list
     """
 
-    checkbox_contents = {
-        "ID": "id",
-        "Rating": "average_rating",
-        "URL": "url",
-        "Duration": "duration",
-        "location": "location",
-        "Getting Around": "getting_around",
-        "Check In/ Out Timing": "check_in_out",
-        "Layout": "layout",
-        "Capacity": "capacity",
-        "Cost": "cost",
-        "Super Host": "super_host",
-        "Amenities": "amenities",
-        "Notes": "notes",
-        "Images": "images",
-        "Cover": "cover",
-    }
-
-    column = checkbox_contents[column]
+    column = CHECKBOX_CONTENTS[column]
 
     if column == "cost":
         # Calculate total cost
@@ -209,38 +290,32 @@ def retrieve_from_json(column: str, listing: dict) -> any:
 
 def create_checkboxes() -> dict:
     """Sets up the checkboxes"""
-    
-    
-    checkbox_contents = {
-        "ID": "id",
-        "Rating": "average_rating",
-        "URL": "url",
-        "Duration": "duration",
-        "Coordinates": "coordinates",
-        "Getting Around": "getting_around",
-        "Check In/ Out Timing": "check_in_out",
-        "Layout": "layout",
-        "Capacity": "capacity",
-        "Cost": "cost",
-        "Super Host": "super_host",
-        "Amenities": "amenities",
-        "Notes": "notes",
-        "Images": "images",
-    }
-
-
-
-def sql_create_connection(db_file: str) -> sqlite3.Connection:
+
+    checkbox_contents = CHECKBOX_CONTENTS
+
+
+
+def sql_create_connection(
+    db_file: str, uri: bool = False, check_same_thread: bool = True
+) -> sqlite3.Connection:
     """
     Create a database connection to the sqlite database (db_file)
 
     Args:
         db_file (_type_): the file that the connection is made to
+        uri (bool): whether db_file is a sqlite URI (e.g. a shared in-memory database)
+        check_same_thread (bool): passed through to sqlite3.connect
     """
     conn = None
 
     try:
-        conn = sqlite3.connect(db_file)
+        conn = sqlite3.connect(
+            db_file, uri=uri, check_same_thread=check_same_thread, cached_statements=256
+        )
+        # Transactions are managed through the connection context manager, so
+        # only the performance pragmas are set here
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
         return conn
     except sqlite3.Error as e:
         print(f"SQLite error occurred: {e}")
@@ -263,6 +338,11 @@ def sql_create_table(conn: sqlite3.Connection, create_table_statement: str) -> N
         print(f"SQLite error has occurred: {e}")
 
 
+# Databases whose tables have already been created in this process, so
+# repeated calls from add_listing do not re-run the CREATE statements
+tables_ready = set()
+
+
 def create_tables(database: str) -> None:
     """
     Creates tables in SQLite, namely the main table, basic info table, and others table
@@ -271,6 +351,9 @@ def create_tables(database: str) -> None:
         database: the database that is going to be accessed
     """
 
+    if database in tables_ready:
+        return
+
     # Queries for creating the tables as required
     sql_create_main_table = """ CREATE TABLE IF NOT EXISTS main (
                                     id integer PRIMARY KEY,
@@ -279,47 +362,121 @@ def create_tables(database: str) -> None:
                                 ); """
 
     sql_create_basic_info_table = """ CREATE TABLE IF NOT EXISTS basic_info (
-                                        listing_id integer UNIQUE NOT NULL,
-                                        coordinates,
-                                        location,
-                                        getting_around,
-                                        check_in_out,
-                                        layout,
-                                        capacity,
-                                        average_rating,
-                                        daily_cost,
-                                        misc_cost,
-                                        super_host,
+                                        listing_id integer PRIMARY KEY,
+                                        coordinates text,
+                                        location text,
+                                        getting_around text,
+                                        check_in_out text,
+                                        layout text,
+                                        capacity integer,
+                                        average_rating real,
+                                        daily_cost integer,
+                                        misc_cost integer,
+                                        super_host integer,
                                         FOREIGN KEY (listing_id) REFERENCES main (id)
                                     ); """
 
     sql_create_others_table = """ CREATE TABLE IF NOT EXISTS others (
-                                        listing_id integer UNIQUE NOT NULL,
-                                        amenities,
-                                        images,
-                                        notes,
-                                        FOREIGN KEY (listing_id) REFERENCES main (id)
-                                    ); """
-
-    sql_create_json_table = """ CREATE TABLE IF NOT EXISTS json (
-                                        listing_id integer UNIQUE NOT NULL,
-                                        json,
+                                        listing_id integer PRIMARY KEY,
+                                        amenities text,
+                                        images text,
+                                        notes text,
                                         FOREIGN KEY (listing_id) REFERENCES main (id)
                                     ); """
 
-    # Creates database connection
-    conn = sql_create_connection(database)
+    # Reuses the shared database connection
+    conn = get_connection(database)
     # Creates the tables
     if conn is not None:
         sql_create_table(conn, sql_create_main_table)
         sql_create_table(conn, sql_create_basic_info_table)
         sql_create_table(conn, sql_create_others_table)
-        sql_create_table(conn, sql_create_json_table)
+        # Dropped from here: any index over LOWER(location) cannot serve the
+        # leading-wildcard LIKE the location search uses, so it would only
+        # slow the inserts down
+        conn.execute("DROP INDEX IF EXISTS basic_info_location_lower_idx")
+        tables_ready.add(database)
         print("All tables created")
     else:
         print("SQLite error: cannot create database connection.")
 
 
+# Fixed column order for each table so the INSERT statements below can be
+# composed once at import; identical statement strings let sqlite3's
+# statement cache skip re-parsing them on every insert
+MAIN_COLUMNS = ("id", "url", "duration")
+BASIC_INFO_COLUMNS = (
+    "listing_id",
+    "coordinates",
+    "location",
+    "getting_around",
+    "check_in_out",
+    "layout",
+    "capacity",
+    "average_rating",
+    "daily_cost",
+    "misc_cost",
+    "super_host",
+)
+OTHERS_COLUMNS = ("listing_id", "amenities", "images", "notes")
+
+INSERT_MAIN = (
+    f"INSERT OR REPLACE INTO main ({', '.join(MAIN_COLUMNS)}) "
+    f"VALUES ({', '.join('?' * len(MAIN_COLUMNS))})"
+)
+INSERT_BASIC_INFO = (
+    f"INSERT OR REPLACE INTO basic_info ({', '.join(BASIC_INFO_COLUMNS)}) "
+    f"VALUES ({', '.join('?' * len(BASIC_INFO_COLUMNS))})"
+)
+INSERT_OTHERS = (
+    f"INSERT OR REPLACE INTO others ({', '.join(OTHERS_COLUMNS)}) "
+    f"VALUES ({', '.join('?' * len(OTHERS_COLUMNS))})"
+)
+TABLE_INSERTS = (
+    (INSERT_MAIN, MAIN_COLUMNS),
+    (INSERT_BASIC_INFO, BASIC_INFO_COLUMNS),
+    (INSERT_OTHERS, OTHERS_COLUMNS),
+)
+
+# Every column of a fully joined listing row, in the order SELECT_LISTING
+# returns them
+LISTING_COLUMNS = MAIN_COLUMNS + BASIC_INFO_COLUMNS[1:] + OTHERS_COLUMNS[1:]
+
+SELECT_LISTING = (
+    "SELECT m.id, m.url, m.duration, "
+    "b.coordinates, b.location, b.getting_around, b.check_in_out, b.layout, "
+    "b.capacity, b.average_rating, b.daily_cost, b.misc_cost, b.super_host, "
+    "o.amenities, o.images, o.notes "
+    "FROM main m "
+    "JOIN basic_info b ON b.listing_id = m.id "
+    "LEFT JOIN others o ON o.listing_id = m.id "
+)
+
+
+def sql_decode_value(value: any) -> any:
+    """
+    Decodes a single value read back from the database
+
+    Nested values are stored as json text, and rows written before scalars
+    were stored natively are json text throughout, so any string that parses
+    as json is decoded and everything else is returned as-is
+    """
+
+    if isinstance(value, str):
+        try:
+            return json_loads(value)
+        except ValueError:
+            return value
+
+    return value
+
+
+def sql_row_to_listing(row: tuple) -> dict:
+    """Builds the listing dict from a fully joined row of SELECT_LISTING"""
+
+    return {column: sql_decode_value(value) for column, value in zip(LISTING_COLUMNS, row)}
+
+
 def sql_add_entry(database: str, items: dict) -> None:
     """
     Adds the entries into the database
@@ -330,55 +487,107 @@ def sql_add_entry(database: str, items: dict) -> None:
         status (customtkinter.Label): For the status
     """
 
-    conn = sql_create_connection(database)
-
-    with conn:
+    conn = get_connection(database)
+    values = sql_entry_values(items)
 
+    with write_lock, conn:
         cursor = conn.cursor()
 
-        # Find the ID to start a new row in each table
-        id = items["id"]
+        # One INSERT per table through the constant prepared statements, all
+        # inside the same transaction so the commit fsyncs once
+        for query, columns in TABLE_INSERTS:
+            cursor.execute(query, tuple(values.get(column) for column in columns))
 
-        # Ensure no duplicate
-        try:
-            cursor.execute("INSERT INTO main (id) VALUES (?)", (id,))
-            cursor.execute("INSERT INTO basic_info (listing_id) VALUES (?)", (id,))
-            cursor.execute("INSERT INTO others (listing_id) VALUES (?)", (id,))
-            conn.commit()
-        except sqlite3.Error as e:
-            print(f"SQLite Error (Duplicate id): {e}")
-
-        # Splits up each item in items into the column name and its value
-        for column, value in items.items():
-            # Check if it is ID
-            if column == "id":
-                continue
-
-            table = db_table_filter(column)
-            # If column not found
-            if table == None:
-                raise ValueError(f"Table not found for {column}: {value}")
-
-            if table == "main":
-                id_column_name = "id"
-            else:
-                id_column_name = "listing_id"
-
-            # Sets up query to update the corresponding cell
-            query = f"UPDATE {table} SET {column} = ? WHERE {id_column_name} = ?"
-
-            # Sets values to json as there are lists and dicts
-            cursor.execute(query, (json.dumps(value), id))
-
-        # Stores the entire info dict as well to easily retrieve all values
-        cursor.execute(
-            "INSERT INTO json (listing_id, json) VALUES (?, ?)", (id, json.dumps(items))
-        )
-
-    conn.commit()
     print("Entry Submitted into Table")
 
 
+def sql_entry_values(items: dict) -> dict:
+    """
+    Serialises a listing's items into the column values the INSERT statements expect
+
+    Rejects columns that belong to no table; only nested values are stored as
+    json, scalars go in as-is
+
+    Args:
+        items (dict): Keys are the columns while the values are the entry for each column
+    """
+
+    values = {"listing_id": items["id"]}
+
+    for column, value in items.items():
+        if column != "id" and db_table_filter(column) is None:
+            raise ValueError(f"Table not found for {column}: {value}")
+
+        if isinstance(value, (list, dict)):
+            value = json_dumps(value)
+
+        values[column] = value
+
+    return values
+
+
+# How many listings go into one bulk-insert transaction before it commits
+BATCH_CHUNK_SIZE = 2000
+
+
+def sql_add_entries(database: str, items_list: list) -> None:
+    """
+    Adds many entries into the database in a single transaction
+
+    Each table is written with one executemany, so the prepared statement runs
+    in a tight loop over the batch. Very large batches are committed in chunks
+    of BATCH_CHUNK_SIZE listings so a single transaction never grows unbounded
+
+    Args:
+        database (str): The database for the items to be stored in
+        items_list (list): The items dicts of every listing in the batch
+    """
+
+    conn = get_connection(database)
+    submitted = 0
+
+    for start in range(0, len(items_list), BATCH_CHUNK_SIZE):
+        chunk = [
+            sql_entry_values(items)
+            for items in items_list[start : start + BATCH_CHUNK_SIZE]
+        ]
+
+        with write_lock, conn:
+            cursor = conn.cursor()
+
+            for query, columns in TABLE_INSERTS:
+                cursor.executemany(
+                    query,
+                    (tuple(values.get(column) for column in columns) for values in chunk),
+                )
+
+        submitted += len(chunk)
+
+    print(f"{submitted} entries submitted into table")
+
+
+# Maps each column to the table it belongs in, built once at import so
+# db_table_filter is a single dict lookup instead of scanning lists
+COLUMN_TO_TABLE = {
+    "id": "main",
+    "url": "main",
+    "duration": "main",
+    "coordinates": "basic_info",
+    "location": "basic_info",
+    "super_host": "basic_info",
+    "capacity": "basic_info",
+    "check_in_out": "basic_info",
+    "layout": "basic_info",
+    "average_rating": "basic_info",
+    "getting_around": "basic_info",
+    "daily_cost": "basic_info",
+    "misc_cost": "basic_info",
+    "amenities": "others",
+    "images": "others",
+    "notes": "others",
+}
+
+
 def db_table_filter(column: str) -> str:
     """
     To find which table the column belongs in, and returns the table name
@@ -387,41 +596,16 @@ def db_table_filter(column: str) -> str:
         column (str): The column name
     """
 
-    # Lists to hold which column belongs in which table
-    main_table = ["id", "url", "duration"]
-    basic_info_table = [
-        "coordinates",
-        "location",
-        "super_host",
-        "capacity",
-        "check_in_out",
-        "layout",
-        "average_rating",
-        "getting_around",
-        "daily_cost",
-        "misc_cost",
-    ]
-    others_table = ["amenities", "images", "notes"]
-    id = ["id"]
-
-    # Returns which table the column is found in
-    column = column.lower()
-    if column in main_table:
-        return "main"
-    if column in basic_info_table:
-        return "basic_info"
-    if column in others_table:
-        return "others"
-    if column in id:
-        return "id"
-
-    return None
+    return COLUMN_TO_TABLE.get(column.lower())
 
 
 def retrieve_from_location(location: str, database: str = DATABASE) -> list:
     """
     Retrieve all the listings that is located at a particular place
 
+    Results are cached per location so that re-searching the same place skips
+    the database entirely; the cache is cleared whenever a listing is added
+
     Args:
         database (str): The database which contains the tables
         location (str): The location to search for
@@ -431,21 +615,32 @@ def retrieve_from_location(location: str, database: str = DATABASE) -> list:
         of a listing
     """
 
-    conn = sql_create_connection(database)
+    # Each caller gets fresh dicts so nobody can mutate the cached ones
+    return [
+        dict(listing)
+        for listing in retrieve_from_location_cached(location.lower().strip(), database)
+    ]
+
+
+@functools.lru_cache(maxsize=64)
+def retrieve_from_location_cached(location: str, database: str) -> list:
+    """Does the actual lookup for retrieve_from_location, with the location already normalised"""
+
+    conn = get_connection(database)
 
     with conn:
         cursor = conn.cursor()
 
-        # Search for all the rows which contains the location
+        # One JOIN fetches every matching listing in a single statement; the
+        # %...% pattern forces a table scan either way, so no index is kept
+        # on LOWER(location)
         cursor.execute(
-            f"SELECT listing_id FROM basic_info WHERE LOWER(location) LIKE LOWER(?)",
+            SELECT_LISTING + "WHERE LOWER(b.location) LIKE ?",
             (f"%{location}%",),
         )
+        rows = cursor.fetchall()
 
-        # Creates a list which stores all the IDs of the location
-        ids = [int(row[0]) for row in cursor.fetchall()]
-    
     # Creates a list of dicts to store the description of all the listings
-    return [Listing.sql_get(id) for id in ids]
+    return [sql_row_to_listing(row) for row in rows]
 
 
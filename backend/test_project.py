@@ -1,4 +1,22 @@
-from project import retrieve_from_json,  db_table_filter, retrieve_from_location
+import pytest
+
+from project import (
+    create_tables,
+    db_table_filter,
+    retrieve_from_json,
+    retrieve_from_location,
+    sql_add_entries,
+    sql_create_connection,
+)
+
+
+@pytest.fixture(scope="module")
+def fresh_db():
+    """Opens one connection to a shared in-memory database used by the connection tests"""
+
+    conn = sql_create_connection("file:testdb?mode=memory&cache=shared", uri=True)
+    yield conn
+    conn.close()
 
 json_data = {"id": "26167241", "url": "https://www.airbnb.com.sg/rooms/26167241?category_tag=Tag%3A7769&enable_m3_private_room=true&photo_id=521380786&search_mode=flex_destinations_search&check_in=2024-06-05&check_out=2024-06-14&source_impression_id=p3_1713878916_5UFcnzhXJ%2BWNPd76&previous_page_section_name=1000&federated_search_id=a2518da7-9a4b-43d6-9593-45a15339dbb1", "duration": 9, "daily_cost": "96", "misc_cost": "259", "coordinates": "{\"latitude\": 34.86449, \"longitude\": 139.08598}", "super_host": False, "capacity": 8, "average_rating": 4.7100000000000035, "check_in_out": ["Check-in after 3:00 pm", "Checkout before 11:00 am", "Self check-in with lockbox"], "layout": [["8 guests", "4 bedrooms", "5 beds", "1 bathroom"]], "amenities": {"Bathroom": ["Hair dryer", "Shampoo", "Hot water"], "Bedroom and laundry": ["Washing machine", "Free dryer \u2013 In unit", "Essentials", "Hangers", "Bed linen", "Extra pillows and blankets"], "Entertainment": ["TV"], "Heating and cooling": ["Air conditioning", "Heating"], "Home safety": ["Exterior security cameras on property", "Smoke alarm", "Carbon monoxide alarm", "Fire extinguisher", "First aid kit"], "Internet and office": ["Wifi", "Pocket wifi"], "Kitchen and dining": ["Kitchen", "Fridge", "Microwave", "Cooking basics", "Dishes and cutlery", "Cooker", "Coffee maker"], "Location features": ["Private entrance"], "Outdoor": ["Garden"], "Parking and facilities": ["Free parking on premises"], "Services": ["Self check-in", "Lockbox"]}, "images": ["https://a0.muscache.com/im/pictures/afcce3e3-0d2f-4f6b-aeca-e177a027ba39.jpg", "https://a0.muscache.com/im/pictures/49d8f89b-2246-4f85-b4ab-d2f20f8a439f.jpg", "https://a0.muscache.com/im/pictures/e47963ef-e2ab-44fb-a642-cd79b4a0a345.jpg", "https://a0.muscache.com/im/pictures/082a11ee-04ad-4830-8fe7-3ce15305e2a6.jpg", "https://a0.muscache.com/im/pictures/d9f5fd47-332e-45a5-a4ad-5a2bb1af5999.jpg", "https://a0.muscache.com/im/pictures/c63bbe41-37e6-4076-a46c-8c3b93b024ee.jpg", "https://a0.muscache.com/im/pictures/69036185-1f37-4c53-82cc-1741aed7ae46.jpg", "https://a0.muscache.com/im/pictures/f9f0e929-2f7e-45b5-9025-5431976c126f.jpg", "https://a0.muscache.com/im/pictures/6a5f64ab-5fa8-4374-be99-e5dfffad6b0f.jpg", "https://a0.muscache.com/im/pictures/91ac1681-69e8-4a54-a3a1-0c909a03d148.jpg", "https://a0.muscache.com/im/pictures/2f153568-58d3-4a52-a057-46515ee7aa03.jpg", "https://a0.muscache.com/im/pictures/e9b3541c-6bf1-4393-8008-5c56dd1c1200.jpg", "https://a0.muscache.com/im/pictures/397c79cd-216a-4962-b910-6c0db2e095e1.jpg", "https://a0.muscache.com/im/pictures/69d322d5-4ed3-4c23-9b00-2c611a2db5a4.jpg", "https://a0.muscache.com/im/pictures/fd438064-1784-4e55-81ee-400e7776891f.jpg", "https://a0.muscache.com/im/pictures/ef81b663-16aa-40ca-a8d6-cf8078589d87.jpg", "https://a0.muscache.com/im/pictures/1c2ac538-aa3a-400e-926b-c0293d42fa4f.jpg", "https://a0.muscache.com/im/pictures/036670cb-2630-4971-aeba-38e7978ce2e9.jpg", "https://a0.muscache.com/im/pictures/61962a03-1232-43c9-a4c1-02171277da4d.jpg", "https://a0.muscache.com/im/pictures/7388786e-2918-437a-8996-7cd6a0542eb7.jpg", "https://a0.muscache.com/im/pictures/0140dd5c-9c29-4cb1-b643-6dc065f7a6da.jpg", "https://a0.muscache.com/im/pictures/ed27a613-23da-4be2-912c-6b605fa95b0e.jpg", "https://a0.muscache.com/im/pictures/db1e97a7-8724-4ed5-a878-d0e9223df6ad.jpg", "https://a0.muscache.com/im/pictures/ea771ad9-246e-4cd4-9c04-9e28c648d658.jpg", "https://a0.muscache.com/im/pictures/6093f84c-6d28-43fb-b324-8b938fe6178d.jpg", "https://a0.muscache.com/im/pictures/2697b723-907f-480e-9ffe-c91ff806d12e.jpg", "https://a0.muscache.com/im/pictures/853a1534-a7b0-408b-b739-7b40b08c1688.jpg", "https://a0.muscache.com/im/pictures/c18b26ec-1880-4ea3-a16a-555bee147f96.jpg", "https://a0.muscache.com/im/pictures/688be1d8-65ce-4ad3-8d39-b91b713152b6.jpg", "https://a0.muscache.com/im/pictures/9baa5d69-675f-40b6-801e-24323f62cc3f.jpg", "https://a0.muscache.com/im/pictures/9e373744-4d74-4866-84c7-5427cf584d82.jpg", "https://a0.muscache.com/im/pictures/f1b322e7-c44b-4461-8201-094b28e29002.jpg", "https://a0.muscache.com/im/pictures/339f31f4-2302-4814-8025-0ef43a931a5f.jpg", "https://a0.muscache.com/im/pictures/4a32eb11-5605-4bfd-a8bf-3cc455440cf3.jpg", "https://a0.muscache.com/im/pictures/08cc59e6-1e2a-432c-823d-123aa2192cad.jpg", "https://a0.muscache.com/im/pictures/d3581d55-4832-4dc6-97cb-051277e81a61.jpg", "https://a0.muscache.com/im/pictures/55b8d8c4-762c-430a-95c2-54010ff3e065.jpg", "https://a0.muscache.com/im/pictures/aa6adff3-0776-47df-ba1a-04e233ad938c.jpg", "https://a0.muscache.com/im/pictures/fb6bb54b-f3a3-4fb6-b914-23025f70fd7e.jpg", "https://a0.muscache.com/im/pictures/adedd0f3-f374-4afc-9603-0e0ad8aab232.jpg", "https://a0.muscache.com/im/pictures/2ee054ea-f8c2-4a01-9556-4e87daa20d89.jpg", "https://a0.muscache.com/im/pictures/0af71242-dc82-4747-85f7-234792cbec47.jpg", "https://a0.muscache.com/im/pictures/37585b83-295e-4a30-b8ce-274fd167d9d5.jpg", "https://a0.muscache.com/im/pictures/fd4bdce8-d054-4140-b4a2-085ce832bd88.jpg", "https://a0.muscache.com/im/pictures/d9a725fe-7c17-4ad7-9d59-1eab817f4f1e.jpg", "https://a0.muscache.com/im/pictures/7dace930-d70f-4f60-b9a5-5fc0837f6765.jpg", "https://a0.muscache.com/im/pictures/533188ef-74b8-4d97-99e4-269c9fc7056e.jpg", "https://a0.muscache.com/im/pictures/e901326e-4ee8-465b-8f8f-c39b75dc9f56.jpg", "https://a0.muscache.com/im/pictures/e5c7d083-26d5-4303-b06f-3cfeaad160a1.jpg"], "location": "Ito, Japan, Shizuoka Prefecture, Japan", "getting_around": "Free parking space for more than 10 cars.\n\n10 min drive from Izu-kogen station.\n10 min walking to a local beach, Akazawa-kaigan. (Note: As of May 2020, the path to Akasawa beach is closed, so we recommend to drive to the beach via R135.)\n6 min drive from the nearest supermarket and the convenience store.\n5 min drive to the large spa resort, DHC."}
 
@@ -9,4 +27,16 @@ def test_db_table_filter():
     assert db_table_filter("id") == "main"
     
 def test_retrieve_from_location():
-    assert True
\ No newline at end of file
+    assert True
+
+def test_sql_create_connection(fresh_db):
+    assert fresh_db is not None
+
+def test_sql_connection_reuse(fresh_db):
+    assert fresh_db.execute("SELECT 1").fetchone() == (1,)
+
+def test_sql_add_entries(tmp_path):
+    database = str(tmp_path / "test.db")
+    create_tables(database)
+    sql_add_entries(database, [json_data])
+    assert retrieve_from_location("ito", database)[0]["id"] == 26167241
\ No newline at end of file
@@ -0,0 +1,12 @@
+from url_utils import extract_from_url, validate_airbnb_url
+
+link = "https://www.airbnb.com.sg/rooms/26167241?category_tag=Tag%3A7769&enable_m3_private_room=true&photo_id=521380786&search_mode=flex_destinations_search&check_in=2024-06-05&check_out=2024-06-14&source_impression_id=p3_1713878916_5UFcnzhXJ%2BWNPd76&previous_page_section_name=1000&federated_search_id=a2518da7-9a4b-43d6-9593-45a15339dbb1"
+
+def test_extract_from_url():
+    assert extract_from_url(link) == ("26167241", 9)
+
+def test_validate_airbnb_url():
+    assert validate_airbnb_url(link)
+
+def test_validate_airbnb_url_rejects_other_sites():
+    assert not validate_airbnb_url("https://www.example.com/rooms/26167241?check_in=2024-06-05&check_out=2024-06-14")
@@ -0,0 +1,92 @@
+import re
+from datetime import date
+from urllib.parse import urlsplit, parse_qsl
+
+# Compiled once at import so every URL check skips the re cache lookup.
+# The dates are matched through lookaheads so that the order of the query
+# parameters does not matter and no greedy .* is left to backtrack over
+# long urls, and .{10} is tightened to an actual date shape
+AIRBNB_URL_RE = re.compile(
+    r"^https:\/\/www\.airbnb\.com(?:\.sg)?\/rooms\/(?P<room>\d+)\?"
+    r"(?=[^#]*\bcheck_in=(?P<check_in>\d{4}-\d{2}-\d{2}))"
+    r"(?=[^#]*\bcheck_out=(?P<check_out>\d{4}-\d{2}-\d{2}))",
+    re.ASCII,
+)
+
+# The hosts that a listing url is allowed to come from
+AIRBNB_HOSTS = ("www.airbnb.com", "www.airbnb.com.sg")
+
+# The prefixes a listing url must start with, for cheap rejection of
+# everything else before any parsing happens
+AIRBNB_URL_PREFIXES = ("https://www.airbnb.com/", "https://www.airbnb.com.sg/")
+
+# Longest url that validation will even look at
+MAX_URL_LENGTH = 2048
+
+
+def extract_from_url(link: str) -> tuple:
+    """
+    To extract information from the url provided, namely the id and duration of stay
+
+    Args:
+        link (str): Airbnb link
+
+    Returns:
+        tuple: the id of the listing and the duration of stay in days
+    """
+
+    # The id and dates are structural parts of the url, so split it once
+    # instead of scanning it with a regex
+    url = urlsplit(link)
+    if url.scheme != "https" or url.hostname not in AIRBNB_HOSTS:
+        raise ValueError(f"Invalid Airbnb link: {link}")
+
+    # The id is the path segment right after /rooms/
+    id = url.path.rpartition("/rooms/")[2].partition("/")[0]
+    if not id.isdigit():
+        raise ValueError(f"Invalid Airbnb link: {link}")
+
+    # Check in and check out dates come from the query parameters
+    params = dict(parse_qsl(url.query))
+    try:
+        check_in = date.fromisoformat(params["check_in"])
+        check_out = date.fromisoformat(params["check_out"])
+    except KeyError:
+        raise ValueError(f"Link is missing check in or check out dates: {link}")
+
+    if check_out < check_in:
+        raise ValueError("Check out date is before check in date")
+
+    # The difference of the date ordinals is already the number of days
+    stay_length = check_out.toordinal() - check_in.toordinal()
+
+    return id, stay_length
+
+
+def validate_airbnb_url(link: str) -> bool:
+    """
+    Checks whether the given link is a valid Airbnb listing url
+
+    Args:
+        link (str): the url to be checked
+    """
+
+    # Trivially wrong urls never reach the regex: not Airbnb, absurdly
+    # long, or missing a query string entirely
+    if (
+        len(link) > MAX_URL_LENGTH
+        or "?" not in link
+        or not link.startswith(AIRBNB_URL_PREFIXES)
+    ):
+        return False
+
+    # Cheap structural check before paying for the full extraction
+    if AIRBNB_URL_RE.search(link) is None:
+        return False
+
+    try:
+        extract_from_url(link)
+    except ValueError:
+        return False
+
+    return True
@@ -1,24 +1,23 @@
 import eel
+from concurrent.futures import ThreadPoolExecutor
+
 from backend import project
 
 eel.init("./web")
 
-# Keeps track of the stuff that are already saved
-location = ""
-listings = []
+# Makes sure the tables exist once at startup so inserts do not have to check
+project.create_tables(project.DATABASE)
+
+# Scrapes run in here so the eel callbacks return immediately and the UI
+# stays responsive while gobnb talks to Airbnb
+scrape_executor = ThreadPoolExecutor(max_workers=4)
 
 @eel.expose
 def update_location(new_location: str) -> None:
     """ Updates the location to be searched """
-    
-    global location
-    global listings
-    
-    if new_location.lower() != location.lower():
-        location = new_location
-        listings = project.retrieve_from_location(location)
-        
-    eel.generateTable(listings)
+
+    # Repeated searches for the same location are served from the cache in project
+    eel.generateTable(project.retrieve_from_location(new_location))
         
 @eel.expose
 def get_row(columns: str, listing) -> any:
@@ -31,8 +30,17 @@ def get_row(columns: str, listing) -> any:
         
     eel.addRow(row)
 
+def report_scrape_result(future) -> None:
+    """Surfaces errors from a background scrape, which would otherwise be lost"""
+
+    if future.exception() is not None:
+        print(f"Scrape failed: {future.exception()}")
+
 @eel.expose
 def add_listing(link, daily_price, misc_price) -> None:
-    project.add_listing(link, [daily_price, misc_price])
+    future = scrape_executor.submit(
+        project.Listing.add_listing, link, [daily_price, misc_price]
+    )
+    future.add_done_callback(report_scrape_result)
 
 eel.start("index.html")
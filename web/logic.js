@@ -167,7 +167,7 @@ function addRow(row) {
                 newCell.appendChild(newSubCell);
 
                 let newListElement;
-                content[0].forEach((content) => {
+                content.forEach((content) => {
                     newListElement = document.createElement("li");
                     newListElement.textContent = content;
                     newSubCell.appendChild(newListElement);